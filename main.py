@@ -1,7 +1,24 @@
-import itertools
+import bisect
+from collections import namedtuple
+import numpy as np
 import pandas as pd
 import os
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, the kernels then run as plain NumPy
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# pandas CSV parser used by load_data. Set to "pyarrow" (when installed) to opt in
+# to its faster multithreaded reader, note it also parses date-like columns as dates
+CSV_ENGINE = "c"
+
 
 class InvalidDataError(Exception):
     """Raised when the input data structure is invalid for discretization."""
@@ -9,6 +26,22 @@ class InvalidDataError(Exception):
     pass
 
 
+# Criterion-independent inputs of the cut search, see prepare_data()
+PreparedData = namedtuple(
+    "PreparedData",
+    [
+        "attributes",
+        "decision",
+        "X",
+        "y",
+        "pair_i",
+        "pair_j",
+        "cand_values",
+        "cand_offsets",
+    ],
+)
+
+
 def load_data(file_path):
     """
     Loads and preprocesses data for discretization
@@ -36,7 +69,20 @@ def load_data(file_path):
 
     # Try to read the file
     try:
-        data = pd.read_csv(file_path)
+        if CSV_ENGINE == "pyarrow":
+            try:
+                data = pd.read_csv(file_path, engine=CSV_ENGINE)
+            except pd.errors.ParserError:
+                # Let the C parser report unreadable files the usual way
+                data = pd.read_csv(file_path)
+            # pyarrow reads whitespace-only files as blank column names and cells
+            if all(not str(col).strip() for col in data.columns) and all(
+                data[col].isna().all() or data[col].astype(str).str.strip().eq("").all()
+                for col in data.columns
+            ):
+                raise pd.errors.EmptyDataError
+        else:
+            data = pd.read_csv(file_path, engine=CSV_ENGINE)
     except pd.errors.EmptyDataError:
         raise ValueError(f"Error: The file '{file_path}' contains no data.")
 
@@ -64,32 +110,224 @@ def prepare_for_discretization(data):
 
 
 def generate_object_pairs(data, decision_col):
-    """Generates pairs of indexes where decision attribute differs."""
-    return [
-        (i, j)
-        for (i, row_i), (j, row_j) in itertools.combinations(data.iterrows(), 2)
-        if row_i[decision_col] != row_j[decision_col]
-    ]
+    """
+    Generates pairs of row positions where decision attribute differs.
+
+    Returns:
+        two aligned arrays (i_idx, j_idx) with i_idx < j_idx
+    """
+    # Integer codes compare much faster than arbitrary (often string) decisions
+    codes = pd.factorize(data[decision_col])[0]
+    # Upper triangle of the decision-inequality matrix, built once as a bool mask
+    differs = np.triu(codes[:, None] != codes[None, :], k=1)
+    return np.nonzero(differs)
 
 
 def find_possible_cuts(values):
-    """Finds possible cuts for given sorted values."""
-    unique_values = sorted(set(values))
-    return [
-        (unique_values[i] + unique_values[i + 1]) / 2
-        for i in range(len(unique_values) - 1)
-    ]
+    """Finds possible cuts (midpoints between consecutive unique values)."""
+    unique_values = np.unique(values)
+    return (unique_values[:-1] + unique_values[1:]) / 2
+
+
+@njit(cache=True)
+def cut_gains(a, b, possible_cuts):
+    """Counts the (a, b) value pairs separated by each of the possible cuts."""
+    # A cut separates a pair when lo <= cut < hi, i.e. lo is passed but hi is not
+    lo = np.sort(np.minimum(a, b))
+    hi = np.sort(np.maximum(a, b))
+    return np.searchsorted(lo, possible_cuts, side="right") - np.searchsorted(
+        hi, possible_cuts, side="right"
+    )
+
+
+@njit(cache=True)
+def cut_rank(gain, cuts_count, total_pairs, use_secondary_criterion):
+    """Orders candidates by the active criterion, a lower rank is better."""
+    if use_secondary_criterion:
+        return cuts_count * (total_pairs + 1) + total_pairs - gain
+    return total_pairs - gain
+
+
+@njit(cache=True)
+def best_attribute_cut(X, k, unsep_i, unsep_j, cand_values, cand_offsets, available):
+    """Finds the best still-available cut of attribute k and returns (gain, cut)."""
+    attr_available = available[cand_offsets[k] : cand_offsets[k + 1]]
+    idx = np.flatnonzero(attr_available)
+    if len(idx) == 0:
+        return 0, 0.0
+    possible_cuts = cand_values[cand_offsets[k] : cand_offsets[k + 1]][idx]
+    col = X[:, k]
+
+    # Existing cuts separate none of these pairs, so only the new one counts
+    gains = cut_gains(col[unsep_i], col[unsep_j], possible_cuts)
+    # Gains only shrink as pairs get separated, drop cuts that reached 0
+    attr_available[idx] = gains > 0
+    best_idx = np.argmax(gains)
+    return gains[best_idx], possible_cuts[best_idx]
 
 
-def check_separation(row1, row2, cuts):
-    """Checks if two rows are separated by given cuts."""
-    for cut in cuts:
-        if (row1 <= cut < row2) or (row2 <= cut < row1):
-            return True
-    return False
+@njit(cache=True, parallel=True)
+def greedy_cuts(X, pair_i, pair_j, cand_values, cand_offsets, use_secondary_criterion):
+    """
+    Greedily adds the best cut until no candidate separates any remaining pair
+
+    Args:
+        X: (n_rows, n_attrs) float64 matrix of attribute values
+        pair_i, pair_j: row positions of pairs with different decisions
+        cand_values: possible cuts of all attributes, concatenated
+        cand_offsets: attribute k owns cand_values[cand_offsets[k]:cand_offsets[k + 1]]
+        use_secondary_criterion: if True, uses the secondary criterion
+
+    Returns:
+        arrays of attribute ids, cut values and gains in the order cuts were added
+    """
+    n_attrs = X.shape[1]
+    total_pairs = len(pair_i)
+    max_cuts = len(cand_values)
+    cut_attr_ids = np.empty(max_cuts, dtype=np.int64)
+    cut_values = np.empty(max_cuts, dtype=np.float64)
+    cut_gains_ = np.empty(max_cuts, dtype=np.int64)
+    cuts_per_attr = np.zeros(n_attrs, dtype=np.int64)
+    # Gains never grow as pairs get separated, so the last best gain of an
+    # attribute bounds every later one
+    attr_bounds = np.full(n_attrs, total_pairs, dtype=np.int64)
+    attr_ranks = np.empty(n_attrs, dtype=np.int64)
+    attr_gains = np.zeros(n_attrs, dtype=np.int64)
+    attr_cuts = np.zeros(n_attrs, dtype=np.float64)
+    available = np.ones(max_cuts, dtype=np.bool_)
+
+    # Pairs not separated by any cut chosen so far
+    unsep_i, unsep_j = pair_i, pair_j
+    n_cuts = 0
+
+    while n_cuts < max_cuts:
+        lead = -1
+        for k in range(n_attrs):
+            attr_gains[k] = 0
+            attr_ranks[k] = cut_rank(
+                attr_bounds[k],
+                cuts_per_attr[k] + 1,
+                total_pairs,
+                use_secondary_criterion,
+            )
+            if attr_bounds[k] > 0 and (lead < 0 or attr_ranks[k] < attr_ranks[lead]):
+                lead = k
+        if lead < 0:
+            break
+
+        # Score the most promising attribute first, its cut is the incumbent
+        gain, cut = best_attribute_cut(
+            X, lead, unsep_i, unsep_j, cand_values, cand_offsets, available
+        )
+        attr_bounds[lead], attr_gains[lead], attr_cuts[lead] = gain, gain, cut
+        lead_rank = cut_rank(
+            gain, cuts_per_attr[lead] + 1, total_pairs, use_secondary_criterion
+        )
+
+        # Score the other attributes in parallel, skipping the ones whose bound
+        # cannot beat the incumbent (ties go to the lower attribute index)
+        for k in prange(n_attrs):
+            if k == lead or attr_bounds[k] == 0:
+                continue
+            if gain > 0 and (
+                attr_ranks[k] > lead_rank or (attr_ranks[k] == lead_rank and k > lead)
+            ):
+                continue
+            attr_gains[k], attr_cuts[k] = best_attribute_cut(
+                X, k, unsep_i, unsep_j, cand_values, cand_offsets, available
+            )
+            attr_bounds[k] = attr_gains[k]
+
+        best_gain, best_attr, best_cut, best_rank = 0, -1, 0.0, 0
+        for k in range(n_attrs):
+            if attr_gains[k] == 0:
+                continue
+            rank = cut_rank(
+                attr_gains[k],
+                cuts_per_attr[k] + 1,
+                total_pairs,
+                use_secondary_criterion,
+            )
+            if best_attr < 0 or rank < best_rank:
+                best_gain, best_attr = attr_gains[k], k
+                best_cut, best_rank = attr_cuts[k], rank
+
+        if best_gain == 0:
+            break
+
+        # Apply the best cut
+        col = X[:, best_attr]
+        keep = (col[unsep_i] <= best_cut) == (col[unsep_j] <= best_cut)
+        unsep_i, unsep_j = unsep_i[keep], unsep_j[keep]
+        cuts_per_attr[best_attr] += 1
+        cut_attr_ids[n_cuts] = best_attr
+        cut_values[n_cuts] = best_cut
+        cut_gains_[n_cuts] = best_gain
+        n_cuts += 1
+
+    return cut_attr_ids[:n_cuts], cut_values[:n_cuts], cut_gains_[:n_cuts]
 
 
-def discretize_data(data, use_secondary_criterion=False, verbose=True):
+def prepare_data(data):
+    """
+    Precomputes the attribute matrix, object pairs and possible cuts,
+    which are the same for both criteria
+
+    Args:
+        data: input DataFrame
+
+    Returns:
+        PreparedData that can be passed to discretize_data
+    """
+    attributes, decision = prepare_for_discretization(data)
+    pair_i, pair_j = generate_object_pairs(data, decision)
+
+    # pandas is only used here and when building the result
+    X = np.ascontiguousarray(data[attributes].to_numpy(dtype=np.float64))
+    y = data[decision].to_numpy()
+    # Row-wise iteration upcast all-numeric rows to one dtype (an int decision next
+    # to float attributes was written as 1.0), keep the output format unchanged
+    if all(isinstance(dt, np.dtype) and dt.kind in "iuf" for dt in data.dtypes):
+        y = y.astype(np.result_type(*data.dtypes))
+
+    possible_cuts = [find_possible_cuts(X[:, k]) for k in range(len(attributes))]
+    cand_offsets = np.zeros(len(attributes) + 1, dtype=np.int64)
+    cand_offsets[1:] = np.cumsum([len(c) for c in possible_cuts])
+    cand_values = np.concatenate(possible_cuts or [np.empty(0)])
+
+    return PreparedData(
+        attributes, decision, X, y, pair_i, pair_j, cand_values, cand_offsets
+    )
+
+
+def find_cuts(prepared, use_secondary_criterion=False):
+    """
+    Runs the greedy cut search on the arrays of prepared data
+
+    Args:
+        prepared: PreparedData of the input DataFrame
+        use_secondary_criterion: if True, uses the secondary criterion
+
+    Returns:
+        list of sorted cut arrays, one per attribute, and the
+        (attribute ids, cut values, gains) arrays in the order cuts were added
+    """
+    history = greedy_cuts(
+        prepared.X,
+        prepared.pair_i,
+        prepared.pair_j,
+        prepared.cand_values,
+        prepared.cand_offsets,
+        use_secondary_criterion,
+    )
+    cut_attr_ids, cut_values, _ = history
+    cuts_per_attr = [
+        np.sort(cut_values[cut_attr_ids == k]) for k in range(prepared.X.shape[1])
+    ]
+    return cuts_per_attr, history
+
+
+def discretize_data(data, use_secondary_criterion=False, verbose=True, prepared=None):
     """
     Discretizes data using either the main criterion (maximize separated pairs)
     or secondary criterion (minimize number of intervals)
@@ -97,120 +335,63 @@ def discretize_data(data, use_secondary_criterion=False, verbose=True):
     Args:
         data: input DataFrame
         use_secondary_criterion: if True, uses the secondary criterion
+        prepared: PreparedData of the same DataFrame, computed when not given
 
     Returns:
         discretized DataFrame and statistics about the discretization
     """
-    attributes, decision = prepare_for_discretization(data)
-    object_pairs = generate_object_pairs(data, decision)
+    if prepared is None:
+        prepared = prepare_data(data)
+    attributes, decision, X = prepared.attributes, prepared.decision, prepared.X
+    total_pairs = len(prepared.pair_i)
     (
-        print(f"Generated {len(object_pairs)} object pairs with different decisions.")
+        print(f"Generated {total_pairs} object pairs with different decisions.")
         if verbose
         else None
     )
 
-    cuts = {attr: [] for attr in attributes}
-    separated_pairs = set()
+    cuts_per_attr, (cut_attr_ids, cut_values, gains) = find_cuts(
+        prepared, use_secondary_criterion
+    )
 
     stats = {
-        "total_pairs": len(object_pairs),
-        "separated_pairs": 0,
-        "cuts_added": 0,
-        "cuts_per_attribute": {attr: 0 for attr in attributes},
+        "total_pairs": total_pairs,
+        "separated_pairs": int(gains.sum()),
+        "cuts_added": len(gains),
+        "cuts_per_attribute": dict(
+            zip(
+                attributes,
+                np.bincount(cut_attr_ids, minlength=len(attributes)).tolist(),
+            )
+        ),
     }
 
-    while True:
-        best = {
-            "gain": 0,
-            "attr": None,
-            "cut": None,
-            "new_separations": set(),
-            "cuts_count": float("inf"),
-        }
-
-        # Try every attribute and every possible cut
-        for attr in attributes:
-            possible_cuts = find_possible_cuts(data[attr])
-
-            for cut in possible_cuts:
-                temp_cuts = sorted(cuts[attr] + [cut])
-                new_separations = {
-                    (i, j)
-                    for i, j in object_pairs
-                    if (i, j) not in separated_pairs
-                    and check_separation(data.at[i, attr], data.at[j, attr], temp_cuts)
-                }
-                gain = len(new_separations)
-                cuts_count = len(temp_cuts)
-
-                if use_secondary_criterion:
-                    if gain > 0 and (
-                        cuts_count < best["cuts_count"]
-                        or (cuts_count == best["cuts_count"] and gain > best["gain"])
-                    ):
-                        best.update(
-                            {
-                                "gain": gain,
-                                "attr": attr,
-                                "cut": cut,
-                                "new_separations": new_separations,
-                                "cuts_count": cuts_count,
-                            }
-                        )
-                else:
-                    if gain > best["gain"]:
-                        best.update(
-                            {
-                                "gain": gain,
-                                "attr": attr,
-                                "cut": cut,
-                                "new_separations": new_separations,
-                                "cuts_count": cuts_count,
-                            }
-                        )
-
-        if best["gain"] == 0:
-            break
-
-        # Apply the best cut
-        cuts[best["attr"]].append(best["cut"])
-        cuts[best["attr"]] = sorted(cuts[best["attr"]])
-        separated_pairs.update(best["new_separations"])
-
-        stats["cuts_added"] += 1
-        stats["cuts_per_attribute"][best["attr"]] += 1
-        stats["separated_pairs"] = len(separated_pairs)
-
-        if verbose:
-            print(
-                f"Added cut {best['cut']} on attribute '{best['attr']}', separated {best['gain']} new pairs."
-            )
-            print(f"Total separated pairs: {len(separated_pairs)}/{len(object_pairs)}")
+    if verbose:
+        cuts = {attr: [] for attr in attributes}
+        separated = 0
+        for attr_id, cut, gain in zip(
+            cut_attr_ids.tolist(), cut_values.tolist(), gains.tolist()
+        ):
+            attr = attributes[attr_id]
+            bisect.insort(cuts[attr], cut)
+            separated += gain
+            print(f"Added cut {cut} on attribute '{attr}', separated {gain} new pairs.")
+            print(f"Total separated pairs: {separated}/{total_pairs}")
             print(f"Current cuts: {cuts}\n")
 
-    # Discretize the dataset
-    discretized_rows = []
-    for idx, row in data.iterrows():
-        new_row = []
-        for attr in attributes:
-            value = row[attr]
-            attr_cuts = cuts[attr]
-            if not attr_cuts:
-                interval = "(-inf; inf)"
-            else:
-                left = "-inf"
-                for cut in attr_cuts:
-                    if value <= cut:
-                        interval = f"({left}; {cut}]"
-                        break
-                    left = cut
-                else:
-                    interval = f"({left}; inf)"
-            new_row.append(interval)
-        new_row.append(row[decision])
-        discretized_rows.append(new_row)
-
-    discretized_df = pd.DataFrame(discretized_rows, columns=attributes + [decision])
+    # Discretize the dataset, one interval label per bin of each attribute
+    discretized = {}
+    for k, attr in enumerate(attributes):
+        attr_cuts = cuts_per_attr[k].tolist()
+        lefts = ["-inf"] + attr_cuts
+        labels = [f"({left}; {cut}]" for left, cut in zip(lefts, attr_cuts)]
+        labels.append(f"({lefts[-1]}; inf)")
+        # right=True puts a value equal to a cut into the interval it closes
+        bins = np.digitize(X[:, k], cuts_per_attr[k], right=True)
+        discretized[attr] = np.array(labels, dtype=object)[bins]
+    discretized[decision] = prepared.y
+
+    discretized_df = pd.DataFrame(discretized, columns=attributes + [decision])
 
     stats["coverage"] = (
         stats["separated_pairs"] / stats["total_pairs"] if stats["total_pairs"] else 0
@@ -224,12 +405,17 @@ def discretize_data(data, use_secondary_criterion=False, verbose=True):
 
 def compare_criteria(data):
     """Compares the main and secondary criteria"""
+    # Pairs and possible cuts don't depend on the criterion, compute them once
+    prepared = prepare_data(data)
+
     print("\n=== Using MAIN CRITERION (maximize separated pairs) ===")
-    main_result, main_stats = discretize_data(data, use_secondary_criterion=False)
+    main_result, main_stats = discretize_data(
+        data, use_secondary_criterion=False, prepared=prepared
+    )
 
     print("\n=== Using SECONDARY CRITERION (minimize number of intervals) ===")
     secondary_result, secondary_stats = discretize_data(
-        data, use_secondary_criterion=True
+        data, use_secondary_criterion=True, prepared=prepared
     )
 
     print("\n=== Comparison Results ===")
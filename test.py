@@ -1,144 +1,263 @@
 import unittest
+import importlib.util
+import pathlib
+import tempfile
+import contextlib
+import io
+import time
+from unittest import mock
 import pandas as pd
 import os
 import numpy as np
-from main import load_data, discretize_data, InvalidDataError
+import main
+from main import (
+    load_data, discretize_data, generate_object_pairs, prepare_data, InvalidDataError
+)
+
+# Feather fixtures need pyarrow, which is optional
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# Timings are only meaningful with the compiled kernels
+try:
+    import numba
+    HAS_NUMBA = not numba.config.DISABLE_JIT
+except ImportError:
+    HAS_NUMBA = False
 
 
 class TestDiscretization(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
+        cls._perf = {}
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls._dir = cls._tmp.name
+        cls.create_fixtures()
         cls.create_test_files()
+        cls.warm_up()
 
     @classmethod
     def tearDownClass(cls):
         cls.cleanup_test_files()
+        for name, elapsed_ns in cls._perf.items():
+            print(f"\n{name} took {elapsed_ns / 1e9:.4f} seconds")
 
     @classmethod
-    def create_test_files(cls):
-        valid_data = pd.DataFrame({
-            'attr1': [1.0, 2.0, 3.0, 4.0, 5.0],
-            'attr2': [0.5, 1.5, 2.5, 3.5, 4.5],
-            'decision': ['A', 'B', 'A', 'B', 'A']
+    def create_fixtures(cls):
+        # Built once from ndarrays, discretize_data does not modify its input
+        cls._basic_df = pd.DataFrame({
+            'attr1': np.array([1.0, 2.0, 3.0, 4.0, 5.0]),
+            'attr2': np.array([0.5, 1.5, 2.5, 3.5, 4.5]),
+            'decision': np.array(['A', 'B', 'A', 'B', 'A'], dtype=object)
+        })
+        cls._comparison_df = pd.DataFrame({
+            'attr1': np.arange(1.0, 9.0),
+            'attr2': np.arange(0.5, 8.0),
+            'decision': np.array(['A', 'B'] * 4, dtype=object)
         })
-        valid_data.to_csv('valid_data.csv', index=False)
+        cls._separated_df = pd.DataFrame({
+            'attr1': np.array([1.0, 2.0, 1.1, 2.1]),
+            'decision': np.array(['A', 'B', 'A', 'B'], dtype=object)
+        })
+
+    @classmethod
+    def create_test_files(cls):
+        cls._basic_df.to_csv(cls.path('valid_data.csv'), index=False)
 
         single_col = pd.DataFrame({'attr1': [1, 2, 3]})
-        single_col.to_csv('single_column.csv', index=False)
+        single_col.to_csv(cls.path('single_column.csv'), index=False)
 
-        open('empty_file.csv', 'a').close()
+        pathlib.Path(cls.path('empty_file.csv')).touch()
+        pathlib.Path(cls.path('whitespace_file.csv')).write_text(' \t\n \n')
 
         all_numeric = pd.DataFrame({
             'attr1': [1, 2, 3],
             'attr2': [4, 5, 6],
             'attr3': [7, 8, 9]
         })
-        all_numeric.to_csv('all_numeric.csv', index=False)
+        all_numeric.to_csv(cls.path('all_numeric.csv'), index=False)
 
+        rng = np.random.default_rng(0)
+        values = rng.random((100, 2))
         large_data = pd.DataFrame({
-            'attr1': np.random.rand(100),
-            'attr2': np.random.rand(100),
-            'decision': np.random.choice(['A', 'B'], 100)
+            'attr1': values[:, 0],
+            'attr2': values[:, 1],
+            'decision': rng.choice(np.array(['A', 'B']), 100)
         })
-        large_data.to_csv('large_data.csv', index=False)
+        large_data.to_csv(
+            cls.path('large_data.csv'), index=False,
+            float_format='%.6g', lineterminator='\n'
+        )
+        if HAS_PYARROW:
+            # Written from the CSV so both copies hold the same rounded values
+            pd.read_csv(cls.path('large_data.csv')).to_feather(cls.path('large_data.feather'))
+
+    @classmethod
+    def warm_up(cls):
+        # Compile the numba kernels up front so the performance test measures
+        # steady-state time, a failure here is left for the real tests to report
+        try:
+            discretize_data(pd.DataFrame({
+                'a': [1.0, 2.0],
+                'b': [0.5, 1.5],
+                'd': ['A', 'B']
+            }), verbose=False)
+        except Exception:
+            pass
 
     @classmethod
     def cleanup_test_files(cls):
-        files = [
-            'valid_data.csv', 'single_column.csv', 'empty_file.csv',
-            'all_numeric.csv', 'large_data.csv',
-            'valid_data.csv_main_discretized.csv',
-            'valid_data.csv_secondary_discretized.csv',
-            'large_data.csv_main_discretized.csv',
-            'large_data.csv_secondary_discretized.csv'
-        ]
-        for file in files:
-            if os.path.exists(file):
-                os.remove(file)
+        cls._tmp.cleanup()
+
+    @classmethod
+    def path(cls, name):
+        """Path of a fixture file inside the temporary test directory"""
+        return os.path.join(cls._dir, name)
 
     def test_load_data_valid(self):
         """Test loading valid data file"""
-        data = load_data('valid_data.csv')
+        data = load_data(self.path('valid_data.csv'))
         self.assertEqual(len(data.columns), 3)
         self.assertEqual(list(data.columns), ['attr1', 'attr2', 'decision'])
 
     def test_load_data_nonexistent_file(self):
         """Test loading nonexistent file"""
         with self.assertRaises(FileNotFoundError):
-            load_data('nonexistent_file.csv')
+            load_data(self.path('nonexistent_file.csv'))
 
     def test_load_data_empty_file(self):
         """Test loading empty file"""
         with self.assertRaises(ValueError):
-            load_data('empty_file.csv')
+            load_data(self.path('empty_file.csv'))
+
+    def test_load_data_whitespace_file(self):
+        """Test loading file with only whitespace"""
+        for engine in ['c', 'pyarrow'] if HAS_PYARROW else ['c']:
+            with self.subTest(engine=engine), mock.patch.object(main, 'CSV_ENGINE', engine):
+                with self.assertRaises(ValueError):
+                    load_data(self.path('whitespace_file.csv'))
 
     def test_load_data_invalid_structure(self):
         """Test loading data with invalid structure"""
         with self.assertRaises(InvalidDataError):
-            load_data('single_column.csv')
+            load_data(self.path('single_column.csv'))
 
         with self.assertRaises(InvalidDataError):
-            load_data('all_numeric.csv')
+            load_data(self.path('all_numeric.csv'))
 
-    def test_discretize_data_basic(self):
-        """Test basic discretization functionality"""
+    def test_generate_object_pairs(self):
+        """Test that only pairs with different decisions are generated"""
         data = pd.DataFrame({
-            'attr1': [1.0, 2.0, 3.0, 4.0, 5.0],
-            'attr2': [0.5, 1.5, 2.5, 3.5, 4.5],
-            'decision': ['A', 'B', 'A', 'B', 'A']
+            'attr1': [1.0, 2.0, 3.0, 4.0],
+            'decision': ['A', 'B', 'A', 'C']
         })
 
-        discretized, stats = discretize_data(data.copy(), verbose=False)
+        pair_i, pair_j = generate_object_pairs(data, 'decision')
+        self.assertEqual(
+            list(zip(pair_i.tolist(), pair_j.tolist())),
+            [(0, 1), (0, 3), (1, 2), (1, 3), (2, 3)]
+        )
+
+    def test_discretize_data_basic(self):
+        """Test basic discretization functionality"""
+        discretized, stats = discretize_data(self._basic_df, verbose=False)
 
         self.assertEqual(len(discretized.columns), 3)
         self.assertEqual(list(discretized.columns), ['attr1', 'attr2', 'decision'])
-        self.assertTrue(all(';' in str(val) for val in discretized['attr1'].values))
-        self.assertTrue(all(';' in str(val) for val in discretized['attr2'].values))
-        self.assertEqual(list(discretized['decision']), ['A', 'B', 'A', 'B', 'A'])
+        self.assertTrue(discretized['attr1'].astype(str).str.contains(';', regex=False).all())
+        self.assertTrue(discretized['attr2'].astype(str).str.contains(';', regex=False).all())
+        self.assertTrue(np.array_equal(
+            discretized['decision'].to_numpy(),
+            np.array(['A', 'B', 'A', 'B', 'A'], dtype=object)
+        ))
         self.assertGreater(stats['separated_pairs'], 0)
         self.assertGreater(stats['cuts_added'], 0)
         self.assertGreater(stats['coverage'], 0)
 
+    def test_discretize_verbose_output(self):
+        """Test verbose progress prints cuts as plain floats"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            discretize_data(self._basic_df, verbose=True)
+        printed = output.getvalue()
+
+        self.assertIn('Current cuts:', printed)
+        self.assertNotIn('np.float64', printed)
+        self.assertRegex(printed, r"Current cuts: \{'attr1': \[(\d+\.\d+(, )?)*\]")
+
     def test_discretize_criteria_comparison(self):
         """Test that secondary criterion produces fewer cuts"""
-        data = pd.DataFrame({
-            'attr1': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
-            'attr2': [0.5, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5],
-            'decision': ['A', 'B', 'A', 'B', 'A', 'B', 'A', 'B']
-        })
+        data = self._comparison_df
+        prepared = prepare_data(data)
+
+        _, main_stats = discretize_data(
+            data, use_secondary_criterion=False, verbose=False, prepared=prepared
+        )
+        _, secondary_stats = discretize_data(
+            data, use_secondary_criterion=True, verbose=False, prepared=prepared
+        )
+
+        with self.subTest(metric='cuts_added'):
+            self.assertLessEqual(secondary_stats['cuts_added'], main_stats['cuts_added'])
+        with self.subTest(metric='coverage'):
+            self.assertGreaterEqual(main_stats['coverage'], secondary_stats['coverage'])
 
-        _, main_stats = discretize_data(data.copy(), use_secondary_criterion=False, verbose=False)
-        _, secondary_stats = discretize_data(data.copy(), use_secondary_criterion=True, verbose=False)
+    def test_discretize_reference_outputs(self):
+        """Test that data2.csv and data3.csv reproduce the committed reference discretizations"""
+        repo_dir = os.path.dirname(os.path.abspath(__file__))
+        expected = {
+            'data2.csv': {
+                'pairs': (14952, 14953),
+                'main': {'a1': 4, 'a2': 3, 'a3': 3, 'a4': 1, 'a5': 2, 'a6': 0, 'a7': 2},
+                'secondary': {'a1': 3, 'a2': 3, 'a3': 2, 'a4': 2, 'a5': 2, 'a6': 2, 'a7': 3},
+            },
+            'data3.csv': {
+                'pairs': (33257, 33264),
+                'main': {'a1': 3, 'a2': 4, 'a3': 3, 'a4': 2, 'a5': 2, 'a6': 2, 'a7': 2, 'a8': 1},
+                'secondary': {'a1': 3, 'a2': 3, 'a3': 3, 'a4': 3, 'a5': 2, 'a6': 2, 'a7': 2, 'a8': 1},
+            },
+        }
 
-        self.assertLessEqual(secondary_stats['cuts_added'], main_stats['cuts_added'])
-        self.assertGreaterEqual(main_stats['coverage'], secondary_stats['coverage'])
+        for file_name, expected_stats in expected.items():
+            data = pd.read_csv(os.path.join(repo_dir, file_name))
+            prepared = prepare_data(data)
+            separated_pairs, total_pairs = expected_stats['pairs']
+            for criterion in ('main', 'secondary'):
+                with self.subTest(file=file_name, criterion=criterion):
+                    discretized, stats = discretize_data(
+                        data, use_secondary_criterion=criterion == 'secondary',
+                        verbose=False, prepared=prepared
+                    )
+                    reference = os.path.join(repo_dir, f'{file_name}_{criterion}_discretized.csv')
+                    with open(reference) as f:
+                        self.assertEqual(discretized.to_csv(index=False), f.read())
+                    self.assertEqual(stats['cuts_per_attribute'], expected_stats[criterion])
+                    self.assertEqual(stats['separated_pairs'], separated_pairs)
+                    self.assertEqual(stats['total_pairs'], total_pairs)
 
+    @unittest.skipUnless(HAS_NUMBA, "numba required for perf test")
     def test_discretize_performance(self):
         """Test performance with larger dataset"""
-        data = pd.read_csv('large_data.csv')
+        if HAS_PYARROW:
+            data = pd.read_feather(self.path('large_data.feather'))
+        else:
+            data = pd.read_csv(self.path('large_data.csv'))
 
-        import time
-        start_time = time.time()
-        discretized, stats = discretize_data(data.copy(), verbose=False)
-        elapsed = time.time() - start_time
+        start_ns = time.perf_counter_ns()
+        discretized, stats = discretize_data(data, verbose=False)
+        elapsed_ns = time.perf_counter_ns() - start_ns
 
-        print(f"\nmain.py took {elapsed:.2f} seconds")
+        self._perf['discretize_large'] = elapsed_ns
+        self.assertLess(elapsed_ns, 2_000_000_000, "perf regression")
         self.assertEqual(len(discretized), len(data))
         self.assertGreater(stats['separated_pairs'], 0)
         self.assertGreater(stats['cuts_added'], 0)
 
     def test_already_separated_data(self):
         """Test data that's already perfectly separated"""
-        data = pd.DataFrame({
-            'attr1': [1.0, 2.0, 1.1, 2.1],
-            'decision': ['A', 'B', 'A', 'B']
-        })
-
-        discretized, stats = discretize_data(data.copy(), verbose=False)
+        discretized, stats = discretize_data(self._separated_df, verbose=False)
         self.assertEqual(stats['coverage'], 1.0)
         self.assertEqual(stats['cuts_added'], 1)
-        unique_intervals = discretized['attr1'].unique()
-        self.assertEqual(len(unique_intervals), 2)
+        self.assertEqual(discretized['attr1'].nunique(), 2)
 
 
 if __name__ == '__main__':